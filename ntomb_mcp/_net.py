@@ -0,0 +1,72 @@
+"""IP address helpers shared by the rule matcher and the MCP tools."""
+
+import ipaddress
+import socket
+import struct
+from functools import lru_cache
+
+# Private/local ranges; single addresses are written as /32 or /128
+_V4_PRIVATE_NETS = (
+    "127.0.0.0/8",
+    "10.0.0.0/8",
+    "172.16.0.0/12",
+    "192.168.0.0/16",
+    "0.0.0.0/32",
+)
+_V6_PRIVATE_NETS = (
+    "::1/128",
+    "::/128",
+    "fe80::/10",
+)
+
+
+def _to_ranges(nets) -> tuple[tuple[int, int], ...]:
+    """Turn CIDR strings into (network, mask) integer pairs."""
+    return tuple(
+        (int(net.network_address), int(net.netmask))
+        for net in map(ipaddress.ip_network, nets)
+    )
+
+
+_V4_PRIVATE = _to_ranges(_V4_PRIVATE_NETS)
+_V6_PRIVATE = _to_ranges(_V6_PRIVATE_NETS)
+
+
+def _group_by_mask(ranges) -> tuple[tuple[int, frozenset[int]], ...]:
+    """Group (network, mask) pairs into (mask, networks) buckets.
+    
+    A lookup then costs one AND plus one set probe per distinct prefix
+    length, however many ranges share that length.
+    """
+    by_mask: dict[int, set[int]] = {}
+    for net, mask in ranges:
+        by_mask.setdefault(mask, set()).add(net & mask)
+    # Longest prefixes first
+    return tuple(
+        (mask, frozenset(nets))
+        for mask, nets in sorted(by_mask.items(), reverse=True)
+    )
+
+
+_V4_PRIVATE_TABLE = _group_by_mask(_V4_PRIVATE)
+_V6_PRIVATE_TABLE = _group_by_mask(_V6_PRIVATE)
+
+
+@lru_cache(maxsize=4096)
+def is_private_ip(ip: str) -> bool:
+    """Check if IP is in private/local range."""
+    if not ip:
+        return True
+    try:
+        # inet_pton, unlike inet_aton, rejects shorthand such as "127.1"
+        ip_int = struct.unpack("!I", socket.inet_pton(socket.AF_INET, ip))[0]
+        table = _V4_PRIVATE_TABLE
+    except (OSError, ValueError):
+        # Not IPv4; drop any zone id ("fe80::1%eth0") before parsing
+        try:
+            packed = socket.inet_pton(socket.AF_INET6, ip.partition("%")[0])
+        except (OSError, ValueError):
+            return False
+        ip_int = int.from_bytes(packed, "big")
+        table = _V6_PRIVATE_TABLE
+    return any((ip_int & mask) in nets for mask, nets in table)
@@ -3,113 +3,402 @@
 Parses suspicious_detection.yaml and applies rules to connections.
 """
 
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
 import yaml
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
+from functools import lru_cache
 from dataclasses import dataclass, field
+from types import MappingProxyType
 
+from ._net import is_private_ip
 
-@dataclass
+# Prefer the libyaml-backed loader; fall back to pure Python if unavailable.
+# server.py loads its YAML files with it too.
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Severity levels, lowest first; the index is the rank used for comparisons
+# (read-only)
+SEVERITY_NAMES = ("normal", "low", "medium", "high", "critical")
+SEVERITY_RANK = MappingProxyType({name: rank for rank, name in enumerate(SEVERITY_NAMES)})
+
+# Compiled rule predicate: (state_bit, remote_port, local_port, remote_external)
+_Matcher = Callable[[int, int, int, bool], tuple[bool, list[str]]]
+
+# Upper-case TCP state -> single bit, so a rule's state gate is one AND
+# against a mask. Seeded with psutil's states; states that only appear in
+# rules get a bit when those rules are compiled.
+_STATE_BITS: dict[str, int] = {}
+_STATE_BITS_LOCK = threading.Lock()
+
+
+def _state_bit(state: str, register: bool = False) -> int:
+    """Bit for an upper-case state, or 0 if it is unknown and not registered."""
+    bit = _STATE_BITS.get(state)
+    if bit is None:
+        if not register:
+            return 0
+        # Allocation reads then grows the table; keep concurrent loads from
+        # handing out the same bit twice
+        with _STATE_BITS_LOCK:
+            bit = _STATE_BITS.get(state)
+            if bit is None:
+                bit = _STATE_BITS[state] = 1 << len(_STATE_BITS)
+    return bit
+
+
+for _state in ("ESTABLISHED", "SYN_SENT", "SYN_RECV", "FIN_WAIT1", "FIN_WAIT2",
+               "TIME_WAIT", "CLOSE", "CLOSE_WAIT", "LAST_ACK", "LISTEN",
+               "CLOSING", "NONE"):
+    _state_bit(_state, register=True)
+del _state
+
+
+@dataclass(slots=True)
 class DetectionRule:
     """A single detection rule from suspicious_detection.yaml."""
     id: str
     name: str
     description: str
     severity: str  # low, medium, high, critical
-    tags: list[str]
+    tags: tuple[str, ...]
     match: dict
     effects: dict
     
+    _matcher: _Matcher = field(init=False, repr=False, compare=False)
+    _sev_rank: int = field(init=False, repr=False, compare=False)
+    # Uses at least one supported criterion / uses only direction=outbound
+    _matchable: bool = field(init=False, repr=False, compare=False)
+    _outbound_only: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._matcher, self._matchable, self._outbound_only = _compile_matcher(self.match)
+        self._sev_rank = SEVERITY_RANK.get(self.severity, 0)
+    
     def matches_connection(self, conn: dict) -> tuple[bool, list[str]]:
         """Check if this rule matches a connection.
         
         Returns:
             (matched: bool, reasons: list of matching criteria)
         """
-        reasons = []
-        
-        # State matching
-        if 'state' in self.match:
-            if conn.get('state', '').upper() == self.match['state'].upper():
-                reasons.append(f"state={self.match['state']}")
-            else:
-                return False, []
-        
-        if 'state_in' in self.match:
-            states = [s.upper() for s in self.match['state_in']]
-            if conn.get('state', '').upper() in states:
-                reasons.append(f"state in {states}")
-            else:
-                return False, []
-        
-        # Port matching
-        if 'remote_port_gte' in self.match:
-            if conn.get('remote_port', 0) >= self.match['remote_port_gte']:
-                reasons.append(f"remote_port >= {self.match['remote_port_gte']}")
-            else:
-                return False, []
-        
-        if 'local_port_gte' in self.match:
-            if conn.get('local_port', 0) >= self.match['local_port_gte']:
-                reasons.append(f"local_port >= {self.match['local_port_gte']}")
-            else:
-                return False, []
+        return self._matcher(*_normalize_connection(conn))
+    
+    def matches_normalized(
+        self, state_bit: int, remote_port: int, local_port: int, remote_external: bool
+    ) -> tuple[bool, list[str]]:
+        """Like matches_connection(), for fields already run through
+        _normalize_connection() (state encoded as its bit, missing values
+        defaulted, remote address reduced to whether it is external).
+        """
+        return self._matcher(state_bit, remote_port, local_port, remote_external)
+
+
+def _normalize_connection(conn: dict) -> tuple[int, int, int, bool]:
+    """Extract the fields rules consult, once per connection.
+    
+    The state is encoded and the remote address classified here rather than
+    by each rule.
+    """
+    remote = conn.get('remote_address', '')
+    return (
+        _state_bit(conn.get('state', '').upper()),
+        conn.get('remote_port', 0),
+        conn.get('local_port', 0),
+        bool(remote) and not is_private_ip(remote),
+    )
+
+
+def _compile_matcher(match: dict) -> tuple[_Matcher, bool, bool]:
+    """Specialize a rule's match criteria into a single predicate closure.
+    
+    Upper-cased states, port bounds and reason strings are resolved once here
+    instead of being re-derived from the match dict for every connection.
+    
+    Returns:
+        (matcher, matchable, outbound_only): whether the match uses any
+        supported criterion, and whether direction=outbound is its only one.
+    """
+    state_mask = None
+    base_reasons = []
+    
+    # State matching; state and state_in must both hold, so their masks AND
+    if 'state' in match:
+        state_mask = _state_bit(match['state'].upper(), register=True)
+        base_reasons.append(f"state={match['state']}")
+    
+    if 'state_in' in match:
+        states = [s.upper() for s in match['state_in']]
+        in_mask = 0
+        for s in states:
+            in_mask |= _state_bit(s, register=True)
+        state_mask = in_mask if state_mask is None else state_mask & in_mask
+        base_reasons.append(f"state in {states}")
+    
+    # Port matching
+    remote_port_gte = match.get('remote_port_gte')
+    if remote_port_gte is not None:
+        base_reasons.append(f"remote_port >= {remote_port_gte}")
+    
+    local_port_gte = match.get('local_port_gte')
+    if local_port_gte is not None:
+        base_reasons.append(f"local_port >= {local_port_gte}")
+    
+    local_port_lte = match.get('local_port_lte')
+    if local_port_lte is not None:
+        base_reasons.append(f"local_port <= {local_port_lte}")
+    
+    # Direction matching (simplified - check if remote is external).
+    # A non-external remote does not fail the rule, it just adds no reason.
+    outbound = match.get('direction') == 'outbound'
+    base_reasons = tuple(base_reasons)
+    
+    def matcher(state_bit, remote_port, local_port, remote_external):
+        if state_mask is not None and not state_bit & state_mask:
+            return False, []
         
-        if 'local_port_lte' in self.match:
-            if conn.get('local_port', 0) <= self.match['local_port_lte']:
-                reasons.append(f"local_port <= {self.match['local_port_lte']}")
-            else:
-                return False, []
+        if remote_port_gte is not None and remote_port < remote_port_gte:
+            return False, []
+        if local_port_gte is not None and local_port < local_port_gte:
+            return False, []
+        if local_port_lte is not None and local_port > local_port_lte:
+            return False, []
         
-        # Direction matching (simplified - check if remote is external)
-        if 'direction' in self.match and self.match['direction'] == 'outbound':
-            remote = conn.get('remote_address', '')
-            if remote and not _is_private_ip(remote):
-                reasons.append("direction=outbound (external IP)")
-            elif 'exclude_private_ips' not in self.match:
-                # Allow if not explicitly excluding private IPs
-                pass
+        if outbound and remote_external:
+            return True, [*base_reasons, "direction=outbound (external IP)"]
         
-        return len(reasons) > 0, reasons
+        if base_reasons:
+            return True, list(base_reasons)
+        return False, []
+    
+    # Every other criterion adds a base reason
+    return matcher, bool(base_reasons) or outbound, outbound and not base_reasons
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectionConfig:
     """Configuration and rules from suspicious_detection.yaml."""
     rules: list[DetectionRule] = field(default_factory=list)
     thresholds: dict = field(default_factory=dict)
     tag_definitions: dict = field(default_factory=dict)
     highlight_styles: dict = field(default_factory=dict)
+    
+    # Filled by index_rules(): candidate rules keyed by (state bit, remote is
+    # external), each in original order, and the fallback per externality
+    # for states no rule is gated on.
+    rules_by_key: dict[tuple[int, bool], list[DetectionRule]] = field(default_factory=dict)
+    rules_any_state: dict[bool, list[DetectionRule]] = field(
+        default_factory=lambda: {True: [], False: []}
+    )
+    # Rule id -> rule (the first one, if ids repeat), all rule ids and the
+    # union of rule tags; also filled by index_rules()
+    rules_by_id: dict[str, DetectionRule] = field(default_factory=dict)
+    rule_ids: frozenset[str] = frozenset()
+    all_tags: frozenset[str] = frozenset()
+    
+    # Normalized fields -> evaluation, shared by analyze_connections_bulk()
+    # calls; reset by index_rules() and when it reaches _EVALUATION_CACHE_MAX.
+    _evaluations: dict = field(default_factory=dict, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.index_rules()
+    
+    def index_rules(self) -> None:
+        """Build the rule dispatch tables from self.rules.
+        
+        Runs on construction; call it again after self.rules is modified.
+        Rules that use no supported criterion can never match and are left out.
+        """
+        self._evaluations = {}
+        self.rules_by_id = {rule.id: rule for rule in reversed(self.rules)}
+        self.rule_ids = frozenset(self.rules_by_id)
+        self.all_tags = frozenset(tag for rule in self.rules for tag in rule.tags)
+        gated = [
+            (rule, _accepted_states(rule.match))
+            for rule in self.rules
+            if rule._matchable
+        ]
+        all_states = set()
+        for _, states in gated:
+            if states is not None:
+                all_states.update(states)
+        
+        def applies(rule, states, state, remote_external):
+            if states is not None and state not in states:
+                return False
+            # A rule whose only criterion is direction=outbound yields no
+            # reason, and so no match, unless the remote is external
+            return remote_external or not rule._outbound_only
+        
+        self.rules_any_state = {
+            ext: [
+                rule for rule, states in gated
+                if states is None and applies(rule, states, None, ext)
+            ]
+            for ext in (True, False)
+        }
+        self.rules_by_key = {
+            (_state_bit(state, register=True), ext): [
+                rule for rule, states in gated if applies(rule, states, state, ext)
+            ]
+            for state in all_states
+            for ext in (True, False)
+        }
+    
+    def rules_for(self, state_bit: int, remote_external: bool) -> list[DetectionRule]:
+        """Rules that can match a connection with the given state bit and
+        remote externality."""
+        rules = self.rules_by_key.get((state_bit, remote_external))
+        if rules is None:
+            return self.rules_any_state[remote_external]
+        return rules
+
+
+def _accepted_states(match: dict) -> Optional[frozenset[str]]:
+    """Upper-cased states a rule is gated on, or None if it accepts any state."""
+    states = None
+    if 'state' in match:
+        states = frozenset([match['state'].upper()])
+    if 'state_in' in match:
+        state_in = frozenset(s.upper() for s in match['state_in'])
+        states = state_in if states is None else states & state_in
+    return states
 
 
-def load_detection_rules(yaml_path: Optional[Path] = None) -> DetectionConfig:
+# Bump when the cached data's layout changes, to orphan old entries
+_CACHE_FORMAT = 1
+
+
+def _cache_path_for(yaml_path: Path) -> Optional[Path]:
+    """Cache location for a rules file, keyed by its path, mtime and size."""
+    try:
+        resolved = yaml_path.resolve()
+        st = resolved.stat()
+    except OSError:
+        return None
+    cache_root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    path_key = hashlib.sha1(str(resolved).encode()).hexdigest()[:12]
+    return Path(cache_root) / "ntomb" / (
+        f"detection_{path_key}_{st.st_mtime_ns}-{st.st_size}-v{_CACHE_FORMAT}.json"
+    )
+
+
+def _is_private_to_us(st: os.stat_result) -> bool:
+    """True if we own the file or directory and nobody else can write to it.
+    
+    The cache decides which rules run, so entries another user could have
+    planted (e.g. a root server started with a user's HOME) are ignored.
+    """
+    return st.st_uid == os.geteuid() and not st.st_mode & 0o022
+
+
+def _load_cached_data(cache_path: Path) -> Optional[dict]:
+    """Return the cached parsed YAML, or None if missing, unreadable or untrusted."""
+    try:
+        if not _is_private_to_us(os.stat(cache_path.parent)):
+            return None
+        fd = os.open(cache_path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+        with open(fd, 'r', encoding='utf-8') as f:
+            if not _is_private_to_us(os.fstat(f.fileno())):
+                return None
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _store_cached_data(cache_path: Path, data: dict) -> None:
+    """Atomically write the parsed YAML as JSON, replacing older entries.
+    
+    Data that does not survive a JSON round trip unchanged is not cached.
+    Failures are ignored; the cache is only an optimization.
+    """
+    try:
+        text = json.dumps(data, ensure_ascii=False)
+        if json.loads(text) != data:
+            return
+    except (TypeError, ValueError):
+        return
+    
+    cache_dir = cache_path.parent
+    prefix = cache_path.name.split('_', 2)
+    try:
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _is_private_to_us(os.stat(cache_dir)):
+            return
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_name, cache_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        # Drop entries for previous versions of the same rules file
+        for stale in cache_dir.glob(f"{prefix[0]}_{prefix[1]}_*.json"):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def find_detection_rules_file() -> Optional[Path]:
+    """Return the first suspicious_detection.yaml found in the common locations."""
+    search_paths = [
+        Path(".kiro/specs/suspicious_detection.yaml"),
+        Path("../.kiro/specs/suspicious_detection.yaml"),
+        Path(__file__).parent.parent / ".kiro/specs/suspicious_detection.yaml",
+    ]
+    for path in search_paths:
+        if path.exists():
+            return path
+    return None
+
+
+def load_detection_rules(
+    yaml_path: Optional[Path] = None, use_cache: bool = True
+) -> DetectionConfig:
     """Load detection rules from suspicious_detection.yaml.
     
+    The parsed YAML is kept as JSON under ~/.cache/ntomb (or
+    $XDG_CACHE_HOME), keyed by the file's mtime and size, so unchanged rules
+    skip YAML parsing on later startups. Only entries owned by the current
+    user, and not writable by others, are read.
+    
     Args:
         yaml_path: Path to YAML file. If None, searches common locations.
+        use_cache: Read and write the on-disk parse cache.
     
     Returns:
         DetectionConfig with parsed rules.
     """
     if yaml_path is None:
-        # Search common locations
-        search_paths = [
-            Path(".kiro/specs/suspicious_detection.yaml"),
-            Path("../.kiro/specs/suspicious_detection.yaml"),
-            Path(__file__).parent.parent / ".kiro/specs/suspicious_detection.yaml",
-        ]
-        for path in search_paths:
-            if path.exists():
-                yaml_path = path
-                break
+        yaml_path = find_detection_rules_file()
     
     if yaml_path is None or not yaml_path.exists():
         # Return empty config if file not found
         return DetectionConfig()
     
-    with open(yaml_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+    cache_path = _cache_path_for(yaml_path) if use_cache else None
+    data = _load_cached_data(cache_path) if cache_path is not None else None
+    if data is None:
+        with open(yaml_path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=YamlLoader)
+        if cache_path is not None:
+            _store_cached_data(cache_path, data)
     
+    return _config_from_data(data)
+
+
+def _config_from_data(data: dict) -> DetectionConfig:
+    """Build a DetectionConfig from parsed suspicious_detection.yaml data."""
     config = DetectionConfig()
     
     # Parse thresholds
@@ -119,12 +408,13 @@ def load_detection_rules(yaml_path: Optional[Path] = None) -> DetectionConfig:
     # Parse rules
     if 'rules' in data:
         for rule_data in data['rules']:
+            # Ids, severities and tags come from a small, repeated vocabulary
             rule = DetectionRule(
-                id=rule_data.get('id', 'unknown'),
+                id=sys.intern(rule_data.get('id', 'unknown')),
                 name=rule_data.get('name', 'Unknown Rule'),
                 description=rule_data.get('description', '').strip(),
-                severity=rule_data.get('severity', 'low'),
-                tags=rule_data.get('tags', []),
+                severity=sys.intern(rule_data.get('severity', 'low')),
+                tags=tuple(map(sys.intern, rule_data.get('tags', []))),
                 match=rule_data.get('match', {}),
                 effects=rule_data.get('effects', {}),
             )
@@ -138,6 +428,7 @@ def load_detection_rules(yaml_path: Optional[Path] = None) -> DetectionConfig:
     if 'highlight_styles' in data:
         config.highlight_styles = data['highlight_styles']
     
+    config.index_rules()
     return config
 
 
@@ -151,15 +442,67 @@ def analyze_connection(conn: dict, config: DetectionConfig) -> dict:
     Returns:
         Analysis result with matched rules, severity, and explanation.
     """
-    matched_rules = []
-    max_severity = "normal"
-    all_tags = set()
-    all_reasons = []
+    return {"connection": conn, **_evaluate(_normalize_connection(conn), config)}
+
+
+# Evaluations kept per config across analyze_connections_bulk() calls
+_EVALUATION_CACHE_MAX = 4096
+# Below this many rules, evaluating is about as cheap as the cache lookup
+_EVALUATION_CACHE_MIN_RULES = 8
+
+
+def analyze_connections_bulk(conns: list[dict], config: DetectionConfig) -> list[dict]:
+    """Analyze many connections at once; same results as analyze_connection().
+    
+    Rules only look at the normalized fields, so connections that share them
+    (e.g. a pile of TIME_WAIT sockets to external hosts) are evaluated once,
+    and for larger rule sets the evaluations are remembered on the config for
+    later calls. Results share their lists; treat them as read-only.
+    
+    Args:
+        conns: Connection dicts, as accepted by analyze_connection().
+        config: Detection configuration with rules.
     
-    severity_order = {"normal": 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
+    Returns:
+        One analysis result per connection, in input order.
+    """
+    return [
+        {"connection": conn, **evaluation}
+        for conn, evaluation in zip(conns, iter_evaluations(conns, config))
+    ]
+
+
+def iter_evaluations(conns: Iterable[dict], config: DetectionConfig) -> Iterator[dict]:
+    """Yield each connection's analysis, lazily and without the "connection" key.
     
-    for rule in config.rules:
-        matched, reasons = rule.matches_connection(conn)
+    For callers that consume results as they go instead of keeping them;
+    evaluations are shared the same way as in analyze_connections_bulk(), so
+    the yielded dicts must not be modified.
+    """
+    if len(config.rules) >= _EVALUATION_CACHE_MIN_RULES:
+        evaluated = config._evaluations
+    else:
+        evaluated = {}
+    
+    for conn in conns:
+        fields = _normalize_connection(conn)
+        evaluation = evaluated.get(fields)
+        if evaluation is None:
+            if len(evaluated) >= _EVALUATION_CACHE_MAX:
+                evaluated.clear()
+            evaluation = evaluated[fields] = _evaluate(fields, config)
+        yield evaluation
+
+
+def _evaluate(fields: tuple[int, int, int, bool], config: DetectionConfig) -> dict:
+    """Run the applicable rules against normalized connection fields."""
+    matched_rules = []
+    max_rank = 0
+    all_tags: set[str] = set()
+    all_reasons: set[str] = set()
+    
+    for rule in config.rules_for(fields[0], fields[3]):
+        matched, reasons = rule.matches_normalized(*fields)
         if matched:
             matched_rules.append({
                 "rule_id": rule.id,
@@ -168,47 +511,22 @@ def analyze_connection(conn: dict, config: DetectionConfig) -> dict:
                 "reasons": reasons,
             })
             all_tags.update(rule.tags)
-            all_reasons.extend(reasons)
+            all_reasons.update(reasons)
             
-            if severity_order.get(rule.severity, 0) > severity_order.get(max_severity, 0):
-                max_severity = rule.severity
+            if rule._sev_rank > max_rank:
+                max_rank = rule._sev_rank
     
     return {
-        "connection": conn,
         "is_suspicious": len(matched_rules) > 0,
-        "severity": max_severity,
+        "severity": SEVERITY_NAMES[max_rank],
         "matched_rules": matched_rules,
         "tags": list(all_tags),
-        "match_reasons": list(set(all_reasons)),
+        "match_reasons": list(all_reasons),
     }
 
 
-def _is_private_ip(ip: str) -> bool:
-    """Check if IP is in private/local range."""
-    if not ip:
-        return True
-    if ip.startswith("127.") or ip.startswith("10."):
-        return True
-    if ip.startswith("192.168."):
-        return True
-    if ip.startswith("172."):
-        parts = ip.split(".")
-        if len(parts) >= 2:
-            try:
-                second = int(parts[1])
-                if 16 <= second <= 31:
-                    return True
-            except ValueError:
-                pass
-    if ip == "::1" or ip.startswith("fe80:") or ip == "::":
-        return True
-    if ip == "0.0.0.0":
-        return True
-    return False
-
-
-# Korean explanations for rules
-RULE_EXPLANATIONS_KO = {
+# Korean explanations for rules (read-only)
+RULE_EXPLANATIONS_KO = MappingProxyType({
     "long_lived_connection": "장기 연결: 10분 이상 유지된 ESTABLISHED 연결입니다. C2 채널이나 백도어일 수 있습니다.",
     "high_port_beaconing": "고포트 비콘: 49152 이상의 포트로 반복 연결하는 패턴입니다. C2 비콘 통신일 수 있습니다.",
     "suspicious_external_country": "의심 국가 연결: 예상치 못한 국가의 IP로 연결되었습니다. 데이터 유출 가능성을 확인하세요.",
@@ -220,12 +538,51 @@ RULE_EXPLANATIONS_KO = {
     "connection_to_tor_exit": "Tor 연결: 알려진 Tor 출구 노드로 연결되었습니다. 익명화 통신일 수 있습니다.",
     "failed_connection_attempts": "연결 실패 반복: 같은 대상으로 연결 시도가 반복 실패하고 있습니다.",
     "privileged_port_binding": "특권 포트 바인딩: 1024 미만 포트에 바인딩되었습니다. root 권한이 필요합니다.",
-}
+})
 
 
+@lru_cache(maxsize=256)
 def get_rule_explanation_ko(rule_id: str) -> str:
-    """Get Korean explanation for a rule."""
-    return RULE_EXPLANATIONS_KO.get(rule_id, f"규칙 '{rule_id}'에 매칭되었습니다.")
+    """Get Korean explanation for a rule (cached; the table is read-only)."""
+    try:
+        return RULE_EXPLANATIONS_KO[rule_id]
+    except KeyError:
+        return f"규칙 '{rule_id}'에 매칭되었습니다."
+
+
+# Tag-specific investigation steps, in the order they are reported
+_TAG_STEP_GROUPS: tuple[tuple[str, ...], ...] = (
+    (
+        "2. 연결 빈도 분석: 주기적인 패턴이 있는지 확인",
+        "3. 원격 IP 평판 조회: VirusTotal, AbuseIPDB 등에서 확인",
+        "4. 프로세스 바이너리 해시 확인: `sha256sum /proc/<pid>/exe`",
+    ),
+    (
+        "2. 전송 데이터량 모니터링: `nethogs` 또는 `iftop` 사용",
+        "3. 프로세스가 접근한 파일 확인: `lsof -p <pid>`",
+    ),
+    (
+        "2. 소켓 상태 확인: `ss -s` 또는 `netstat -s`",
+        "3. 애플리케이션 로그 확인",
+        "4. 연결 종료 로직 코드 리뷰",
+    ),
+    (
+        "2. 리스닝 포트 확인: `ss -tlnp`",
+        "3. 해당 포트가 의도된 서비스인지 확인",
+        "4. 방화벽 규칙 검토",
+    ),
+)
+
+# Tag -> index into _TAG_STEP_GROUPS
+_TAG_STEP_GROUP = {
+    "beacon": 0,
+    "c2": 0,
+    "exfiltration": 1,
+    "resource_leak": 2,
+    "performance": 2,
+    "listener": 3,
+    "backdoor": 3,
+}
 
 
 def generate_investigation_steps(analysis: dict) -> list[str]:
@@ -239,31 +596,19 @@ def generate_investigation_steps(analysis: dict) -> list[str]:
     """
     steps = []
     conn = analysis.get("connection", {})
-    tags = set(analysis.get("tags", []))
     
     # Common first step
     if conn.get("pid"):
         steps.append(f"1. 프로세스 확인: `ps -p {conn['pid']} -o pid,ppid,user,cmd`")
     
-    # Tag-specific steps
-    if "beacon" in tags or "c2" in tags:
-        steps.append("2. 연결 빈도 분석: 주기적인 패턴이 있는지 확인")
-        steps.append("3. 원격 IP 평판 조회: VirusTotal, AbuseIPDB 등에서 확인")
-        steps.append("4. 프로세스 바이너리 해시 확인: `sha256sum /proc/<pid>/exe`")
-    
-    if "exfiltration" in tags:
-        steps.append("2. 전송 데이터량 모니터링: `nethogs` 또는 `iftop` 사용")
-        steps.append("3. 프로세스가 접근한 파일 확인: `lsof -p <pid>`")
-    
-    if "resource_leak" in tags or "performance" in tags:
-        steps.append("2. 소켓 상태 확인: `ss -s` 또는 `netstat -s`")
-        steps.append("3. 애플리케이션 로그 확인")
-        steps.append("4. 연결 종료 로직 코드 리뷰")
-    
-    if "listener" in tags or "backdoor" in tags:
-        steps.append("2. 리스닝 포트 확인: `ss -tlnp`")
-        steps.append("3. 해당 포트가 의도된 서비스인지 확인")
-        steps.append("4. 방화벽 규칙 검토")
+    # Tag-specific steps, one lookup per tag
+    groups = {
+        _TAG_STEP_GROUP[tag]
+        for tag in analysis.get("tags", ())
+        if tag in _TAG_STEP_GROUP
+    }
+    for group in sorted(groups):
+        steps.extend(_TAG_STEP_GROUPS[group])
     
     if not steps:
         steps.append("1. 연결 상태 지속 모니터링")
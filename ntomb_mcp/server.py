@@ -7,36 +7,272 @@ Uses FastMCP for easy tool definition with automatic schema generation.
 """
 
 from mcp.server.fastmcp import FastMCP
+import asyncio
+import os
 import psutil
+import re
+import sys
+import threading
+import time
+import yaml
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache, wraps
+from itertools import islice, repeat
 from typing import Optional
 from pathlib import Path
 
 from .detection_rules import (
     load_detection_rules,
+    find_detection_rules_file,
     analyze_connection,
+    analyze_connections_bulk,
+    iter_evaluations,
     get_rule_explanation_ko,
     generate_investigation_steps,
     DetectionConfig,
+    RULE_EXPLANATIONS_KO,
+    SEVERITY_NAMES,
+    SEVERITY_RANK,
+    YamlLoader,
 )
+from ._net import is_private_ip
 
 # Initialize MCP server
 mcp = FastMCP("ntomb-os-intel", json_response=True)
 
-# Load detection rules at startup
+def _in_thread(fn):
+    """Turn a blocking tool body into an async tool run in a worker thread.
+    
+    FastMCP calls sync tools directly on its event loop, so one /proc walk
+    would stall every other request. Run in a thread, concurrent calls
+    instead queue on the snapshot lock and share the scan it produces.
+    """
+    @wraps(fn)
+    async def run_in_thread(*args, **kwargs):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return run_in_thread
+
+
+# Detection rules, reloaded when the YAML file's (path, mtime, size) changes
 _detection_config: Optional[DetectionConfig] = None
+_detection_config_stamp: Optional[tuple[str, int, int]] = None
+_detection_config_lock = threading.Lock()
 
 def get_detection_config() -> DetectionConfig:
-    """Lazy-load detection configuration."""
-    global _detection_config
-    if _detection_config is None:
-        _detection_config = load_detection_rules()
-    return _detection_config
+    """Return the detection configuration, reparsing only after the YAML changes.
+    
+    Each call costs one stat() of the rules file; edits to the rules are
+    picked up by the next tool call without restarting the server. Tools run
+    in worker threads, so the reload is serialized: the file is parsed once
+    and rule states are registered by a single thread.
+    """
+    global _detection_config, _detection_config_stamp
+    yaml_path = find_detection_rules_file()
+    stamp = None
+    if yaml_path is not None:
+        try:
+            st = yaml_path.stat()
+            stamp = (str(yaml_path), st.st_mtime_ns, st.st_size)
+        except OSError:
+            yaml_path = None
+    
+    with _detection_config_lock:
+        if _detection_config is None or stamp != _detection_config_stamp:
+            _detection_config = load_detection_rules(yaml_path)
+            _detection_config_stamp = stamp
+        return _detection_config
+
+
+# PID -> (expires_at, process name). The TTL is short so a reused PID is
+# picked up quickly; the cache is simply reset once it grows past the cap.
+_PID_NAME_TTL = 5.0
+_PID_NAME_CACHE_MAX = 1024
+_pid_name_cache: dict[int, tuple[float, str]] = {}
+
+
+# Read short names straight from /proc/<pid>/comm where it exists
+_PROC_COMM = sys.platform.startswith("linux")
+# The kernel truncates comm to TASK_COMM_LEN - 1 bytes
+_COMM_MAX = 15
+
+
+def _read_pid_name(pid: int) -> str:
+    """Look up a process name without caching.
+    
+    Names are interned: many PIDs share one (worker pools, shells), and the
+    records built from them then share a single string.
+    """
+    if _PROC_COMM:
+        try:
+            with open(f"/proc/{pid}/comm", "rb", buffering=0) as f:
+                comm = f.read().rstrip(b"\n")
+        except OSError:
+            pass
+        else:
+            # A name cut at the limit may be truncated; psutil recovers the
+            # full one from cmdline
+            if len(comm) < _COMM_MAX:
+                return sys.intern(comm.decode(errors="replace"))
+    
+    return sys.intern(psutil.Process(pid).name())
+
+
+def _pid_name(pid: int) -> str:
+    """Resolve a PID to its process name, caching the result briefly."""
+    now = time.monotonic()
+    cached = _pid_name_cache.get(pid)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
+    try:
+        name = _read_pid_name(pid)
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        name = "unknown"
+    
+    if len(_pid_name_cache) >= _PID_NAME_CACHE_MAX:
+        _pid_name_cache.clear()
+    _pid_name_cache[pid] = (now + _PID_NAME_TTL, name)
+    return name
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment, ignoring unparsable values."""
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+# Most recent psutil.net_connections() result as (monotonic time, conns).
+# NTOMB_NETCONN_INTERVAL sets how long (in seconds) one scan is reused.
+_CONN_SNAPSHOT_TTL = _env_float("NTOMB_NETCONN_INTERVAL", 1.0)
+_conn_snapshot: Optional[tuple[float, list]] = None
+_conn_snapshot_lock = threading.Lock()
+
+
+def _snapshot_connections(ttl: float = _CONN_SNAPSHOT_TTL) -> list:
+    """Return the system's TCP connections, reusing a scan younger than ttl.
+    
+    Each scan walks /proc; tools called back-to-back (or one tool fanning out
+    into others) share a single walk instead of repeating it.
+    """
+    global _conn_snapshot
+    with _conn_snapshot_lock:
+        if _conn_snapshot is not None and time.monotonic() - _conn_snapshot[0] < ttl:
+            return _conn_snapshot[1]
+        
+        try:
+            conns = psutil.net_connections(kind='tcp')
+        except psutil.AccessDenied:
+            # No permission (non-root)
+            conns = []
+        _conn_snapshot = (time.monotonic(), conns)
+        return conns
+
+
+def _snapshot_age_ms() -> int:
+    """Milliseconds since the current connection snapshot was taken."""
+    snapshot = _conn_snapshot
+    if snapshot is None:
+        return 0
+    return int((time.monotonic() - snapshot[0]) * 1000)
+
+
+@dataclass(slots=True)
+class _ConnSnapshot:
+    """list_connections records for one psutil scan, plus lookup indices.
+    
+    Built once per scan and shared by every tool reading it; read-only.
+    """
+    conns: list                              # the raw psutil result
+    records: list[dict]
+    by_pid: dict[int, list[dict]]
+    by_remote: dict[str, list[dict]]         # "ip:port" -> records, remote set
+    pids: frozenset[int]                     # non-zero PIDs
+    remotes: frozenset[str]                  # "ip:port" keys, minus 0.0.0.0
+    # Memoized by _snapshot_analysis(): heuristic flags per high_port_threshold,
+    # and the rule report with the config it was evaluated against
+    suspicious: dict[int, list[dict]] = field(default_factory=dict)
+    report: Optional[tuple[DetectionConfig, dict]] = None
+
+
+_conn_records: Optional[_ConnSnapshot] = None
+_conn_records_lock = threading.Lock()
+
+
+def _connection_records() -> _ConnSnapshot:
+    """Return the indexed list_connections records for the current snapshot."""
+    global _conn_records
+    conns = _snapshot_connections()
+    with _conn_records_lock:
+        if _conn_records is not None and _conn_records.conns is conns:
+            return _conn_records
+        
+        # One name lookup per PID, however many sockets the process holds
+        names = {pid: _pid_name(pid) for pid in {conn.pid for conn in conns} if pid is not None}
+        records = []
+        by_pid: dict[int, list[dict]] = {}
+        by_remote: dict[str, list[dict]] = {}
+        for conn in conns:
+            pid = conn.pid
+            
+            # Skip if no PID (kernel connections)
+            if pid is None:
+                continue
+            
+            # Parse addresses
+            laddr, raddr = conn.laddr, conn.raddr
+            local_addr, local_port = (laddr.ip, laddr.port) if laddr else ("", 0)
+            remote_addr, remote_port = (raddr.ip, raddr.port) if raddr else ("", 0)
+            
+            record = {
+                "pid": pid,
+                "process_name": names[pid],
+                "local_address": local_addr,
+                "local_port": local_port,
+                "remote_address": remote_addr,
+                "remote_port": remote_port,
+                "state": conn.status,
+                "proto": "tcp"
+            }
+            records.append(record)
+            by_pid.setdefault(pid, []).append(record)
+            if remote_addr:
+                by_remote.setdefault(f"{remote_addr}:{remote_port}", []).append(record)
+        
+        _conn_records = _ConnSnapshot(
+            conns=conns,
+            records=records,
+            by_pid=by_pid,
+            by_remote=by_remote,
+            pids=frozenset(pid for pid in by_pid if pid),
+            remotes=frozenset(
+                remote for remote in by_remote if not remote.startswith("0.0.0.0:")
+            ),
+        )
+        return _conn_records
+
+
+def _snapshot_records(pid: Optional[int] = None) -> list[dict]:
+    """Current snapshot's records, or only those of pid if given.
+    
+    For tools that build on the connection list: they read the shared
+    records directly instead of going through list_connections' copy. Both
+    the list and its records are read-only.
+    """
+    snapshot = _connection_records()
+    if pid:
+        return snapshot.by_pid.get(pid, [])
+    return snapshot.records
 
 
 @mcp.tool()
+@_in_thread
 def list_connections(
     state_filter: Optional[str] = None,
-    pid_filter: Optional[int] = None
+    pid_filter: Optional[int] = None,
+    limit: Optional[int] = None
 ) -> list[dict]:
     """List active TCP network connections with pid, ports, and state.
     
@@ -45,101 +281,101 @@ def list_connections(
     Args:
         state_filter: Optional filter by connection state (e.g., "ESTABLISHED", "LISTEN", "TIME_WAIT")
         pid_filter: Optional filter by process ID
+        limit: Optional maximum number of connections to return, to bound
+            the response size on hosts with many sockets
     
     Returns:
         List of connection objects with pid, process_name, addresses, ports, state, and protocol.
     """
-    connections = []
+    if limit is not None:
+        limit = max(limit, 0)
     
-    try:
-        for conn in psutil.net_connections(kind='tcp'):
-            # Skip if no PID (kernel connections)
-            if conn.pid is None:
-                continue
-            
-            # Apply filters
-            if pid_filter and conn.pid != pid_filter:
-                continue
-            
-            state = conn.status
-            if state_filter and state.upper() != state_filter.upper():
-                continue
-            
-            # Get process name
-            try:
-                proc = psutil.Process(conn.pid)
-                process_name = proc.name()
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                process_name = "unknown"
-            
-            # Parse addresses
-            local_addr = conn.laddr.ip if conn.laddr else ""
-            local_port = conn.laddr.port if conn.laddr else 0
-            remote_addr = conn.raddr.ip if conn.raddr else ""
-            remote_port = conn.raddr.port if conn.raddr else 0
-            
-            connections.append({
-                "pid": conn.pid,
-                "process_name": process_name,
-                "local_address": local_addr,
-                "local_port": local_port,
-                "remote_address": remote_addr,
-                "remote_port": remote_port,
-                "state": state,
-                "proto": "tcp"
-            })
-    except psutil.AccessDenied:
-        # Return empty list if no permission (non-root)
-        pass
+    # Apply filters
+    records = _snapshot_records(pid_filter)
+    
+    if state_filter:
+        state_filter = state_filter.upper()
+        # Stops scanning once limit matches are found
+        return list(islice((c for c in records if c["state"].upper() == state_filter), limit))
     
-    return connections
+    return records[:limit]
+
+
+def _join_truncated(parts, limit: int) -> str:
+    """Return ' '.join(parts)[:limit] without joining parts past the limit.
+    
+    Command lines of JVMs and browsers can run to many kilobytes, of which
+    only the first few hundred characters are ever shown.
+    """
+    kept = []
+    length = 0
+    for part in parts:
+        # length counts a separator after every kept part
+        if length > limit:
+            break
+        kept.append(part)
+        length += len(part) + 1
+    return ' '.join(kept)[:limit]
 
 
 @mcp.tool()
+@_in_thread
 def list_processes(
     name_filter: Optional[str] = None,
-    with_connections: bool = False
+    with_connections: bool = False,
+    include_stats: bool = False
 ) -> list[dict]:
     """List running processes with optional network connection info.
     
     Args:
         name_filter: Optional substring filter for process name
         with_connections: If True, include connection count for each process
+        include_stats: If True, include cpu_percent and memory_percent (costs
+            extra /proc reads per process)
     
     Returns:
-        List of process objects with pid, name, cmdline, cpu_percent, memory_percent.
+        List of process objects with pid, name, cmdline, and optionally
+        cpu_percent, memory_percent and connection_count.
     """
     processes = []
     
     # Get connection counts per PID if requested
-    conn_counts = {}
+    conn_counts = Counter()
     if with_connections:
+        conn_counts.update(conn.pid for conn in _snapshot_connections() if conn.pid)
+    
+    attrs = ['pid', 'name', 'cmdline']
+    if include_stats:
+        attrs += ['cpu_percent', 'memory_percent']
+    
+    if name_filter:
+        # Two-phase: scan names only, then fetch the costly attributes
+        # (cpu/memory stats, cmdline) just for the processes that match
+        needle = name_filter.lower()
+        procs = (
+            proc for proc in psutil.process_iter(['pid', 'name'])
+            if needle in (proc.info['name'] or '').lower()
+        )
+    else:
+        procs = psutil.process_iter(attrs)
+    
+    for proc in procs:
         try:
-            for conn in psutil.net_connections(kind='tcp'):
-                if conn.pid:
-                    conn_counts[conn.pid] = conn_counts.get(conn.pid, 0) + 1
-        except psutil.AccessDenied:
-            pass
-    
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'cpu_percent', 'memory_percent']):
-        try:
-            info = proc.info
+            info = proc.as_dict(attrs=attrs) if name_filter else proc.info
             name = info.get('name', '')
             
-            # Apply name filter
-            if name_filter and name_filter.lower() not in name.lower():
-                continue
-            
             cmdline = info.get('cmdline') or []
             
             process_data = {
                 "pid": info['pid'],
                 "name": name,
-                "cmdline": ' '.join(cmdline)[:200],  # Truncate for safety
-                "cpu_percent": info.get('cpu_percent', 0.0),
-                "memory_percent": round(info.get('memory_percent', 0.0), 2)
+                "cmdline": _join_truncated(cmdline, 200),  # Truncate for safety
             }
             
+            if include_stats:
+                process_data["cpu_percent"] = info.get('cpu_percent', 0.0)
+                process_data["memory_percent"] = round(info.get('memory_percent', 0.0), 2)
+            
             if with_connections:
                 process_data["connection_count"] = conn_counts.get(info['pid'], 0)
             
@@ -151,7 +387,37 @@ def list_processes(
     return processes
 
 
+def _check_listen(conn, high_port_threshold: int) -> list[str]:
+    """High port listener."""
+    if conn.laddr and conn.laddr.port > high_port_threshold:
+        return ["high_port_listener"]
+    return []
+
+
+def _check_established(conn, high_port_threshold: int) -> list[str]:
+    """External connection on high port."""
+    if conn.raddr and conn.raddr.port > high_port_threshold:
+        # Check if remote is not private IP
+        if not is_private_ip(conn.raddr.ip):
+            return ["external_high_port"]
+    return []
+
+
+def _check_close_wait(conn, high_port_threshold: int) -> list[str]:
+    """CLOSE_WAIT accumulation (potential resource leak)."""
+    return ["close_wait_leak"]
+
+
+# Connection state -> heuristic returning the reasons it flags
+_SUSPICIOUS_STATE_CHECKS = {
+    'LISTEN': _check_listen,
+    'ESTABLISHED': _check_established,
+    'CLOSE_WAIT': _check_close_wait,
+}
+
+
 @mcp.tool()
+@_in_thread
 def get_suspicious_connections(
     min_duration_seconds: int = 600,
     high_port_threshold: int = 49152
@@ -167,127 +433,122 @@ def get_suspicious_connections(
     Returns:
         List of suspicious connections with reason tags.
     """
-    suspicious = []
-    
-    try:
-        for conn in psutil.net_connections(kind='tcp'):
-            if conn.pid is None:
-                continue
-            
-            reasons = []
-            
-            # High port listener
-            if conn.status == 'LISTEN' and conn.laddr:
-                if conn.laddr.port > high_port_threshold:
-                    reasons.append("high_port_listener")
-            
-            # External connection on high port
-            if conn.status == 'ESTABLISHED' and conn.raddr:
-                if conn.raddr.port > high_port_threshold:
-                    # Check if remote is not private IP
-                    remote_ip = conn.raddr.ip
-                    if not _is_private_ip(remote_ip):
-                        reasons.append("external_high_port")
-            
-            # CLOSE_WAIT accumulation (potential resource leak)
-            if conn.status == 'CLOSE_WAIT':
-                reasons.append("close_wait_leak")
-            
-            if reasons:
-                try:
-                    proc = psutil.Process(conn.pid)
-                    process_name = proc.name()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    process_name = "unknown"
-                
-                suspicious.append({
-                    "pid": conn.pid,
-                    "process_name": process_name,
-                    "local_address": conn.laddr.ip if conn.laddr else "",
-                    "local_port": conn.laddr.port if conn.laddr else 0,
-                    "remote_address": conn.raddr.ip if conn.raddr else "",
-                    "remote_port": conn.raddr.port if conn.raddr else 0,
-                    "state": conn.status,
-                    "reasons": reasons
-                })
-    except psutil.AccessDenied:
-        pass
-    
-    return suspicious
-
+    suspicious, _ = _snapshot_analysis(high_port_threshold)
+    return list(suspicious)
 
-def _is_private_ip(ip: str) -> bool:
-    """Check if IP is in private/local range."""
-    if ip.startswith("127.") or ip.startswith("10."):
-        return True
-    if ip.startswith("192.168."):
-        return True
-    if ip.startswith("172."):
-        parts = ip.split(".")
-        if len(parts) >= 2:
-            second = int(parts[1])
-            if 16 <= second <= 31:
-                return True
-    if ip == "::1" or ip.startswith("fe80:"):
-        return True
-    return False
-
-
-# =============================================================================
-# Security Analyst Tools (ntomb-security-analyst)
-# =============================================================================
 
-@mcp.tool()
-def analyze_connections() -> dict:
-    """Analyze all current connections against ntomb's detection rules.
+def _snapshot_analysis(
+    high_port_threshold: Optional[int] = None,
+    with_report: bool = False,
+) -> tuple[Optional[list[dict]], Optional[dict]]:
+    """Heuristic flags and/or the rule report for the current snapshot.
+    
+    Each view is memoized on the snapshot: the heuristic flags per
+    threshold, the rule report per config. Only the requested views are
+    built, so the heuristics never load the detection rules; views that are
+    requested together and both missing come from one walk. Results are
+    shared, so treat them as read-only.
     
-    Applies rules from suspicious_detection.yaml to identify suspicious patterns.
-    Returns a security analysis report with categorized findings.
+    Args:
+        high_port_threshold: Build the heuristic flags for this threshold;
+            None skips them.
+        with_report: Build the rule report.
     
     Returns:
-        Analysis report with summary, findings by severity, and recommendations.
+        (get_suspicious_connections entries, analyze_connections report
+        without snapshot_age_ms); a view that was not requested is None.
     """
-    config = get_detection_config()
-    connections = list_connections()
-    
+    snapshot = _connection_records()
+    suspicious = None
+    if high_port_threshold is not None:
+        suspicious = snapshot.suspicious.get(high_port_threshold)
+    config = report = None
+    if with_report:
+        config = get_detection_config()
+        if snapshot.report is not None and snapshot.report[0] is config:
+            report = snapshot.report[1]
+    
+    need_heuristics = high_port_threshold is not None and suspicious is None
+    need_report = with_report and report is None
+    if not need_heuristics and not need_report:
+        return suspicious, report
+    
+    records = snapshot.records
+    if need_heuristics:
+        suspicious = []
     findings = {
         "critical": [],
         "high": [],
         "medium": [],
         "low": [],
-        "normal": [],
     }
-    
     all_tags = set()
     
-    for conn in connections:
-        analysis = analyze_connection(conn, config)
-        severity = analysis.get("severity", "normal")
+    # Records are the snapshot's connections that have a PID, in order.
+    # With no rules loaded nothing can match, so skip rule evaluation; it is
+    # also skipped when the report is not needed.
+    conns = (conn for conn in snapshot.conns if conn.pid is not None)
+    if need_report and config.rules:
+        analyses = iter_evaluations(records, config)
+    else:
+        analyses = repeat(None)
+    
+    for conn, record, analysis in zip(conns, records, analyses):
+        # Only the heuristic for this state runs; other states are skipped
+        check = _SUSPICIOUS_STATE_CHECKS.get(conn.status) if need_heuristics else None
+        if check is not None:
+            reasons = check(conn, high_port_threshold)
+            if reasons:
+                suspicious.append({
+                    "pid": record["pid"],
+                    "process_name": record["process_name"],
+                    "local_address": record["local_address"],
+                    "local_port": record["local_port"],
+                    "remote_address": record["remote_address"],
+                    "remote_port": record["remote_port"],
+                    "state": record["state"],
+                    "reasons": reasons
+                })
         
-        if analysis.get("is_suspicious"):
-            finding = {
-                "connection": {
-                    "pid": conn.get("pid"),
-                    "process_name": conn.get("process_name"),
-                    "remote": f"{conn.get('remote_address')}:{conn.get('remote_port')}",
-                    "local": f"{conn.get('local_address')}:{conn.get('local_port')}",
-                    "state": conn.get("state"),
-                },
-                "matched_rules": [r["rule_name"] for r in analysis.get("matched_rules", [])],
-                "tags": analysis.get("tags", []),
-            }
-            findings[severity].append(finding)
-            all_tags.update(analysis.get("tags", []))
-        else:
-            findings["normal"].append(conn)
+        # Normal connections (the vast majority) are only counted, so nothing
+        # is read or formatted for them
+        if analysis is None or not analysis["is_suspicious"]:
+            continue
+        
+        tags = analysis["tags"]
+        all_tags.update(tags)
+        
+        # A match on rules with no ranked severity stays out of the report
+        bucket = findings.get(analysis["severity"])
+        if bucket is None:
+            continue
+        
+        bucket.append({
+            "connection": {
+                "pid": record["pid"],
+                "process_name": record["process_name"],
+                "remote": f"{record['remote_address']}:{record['remote_port']}",
+                "local": f"{record['local_address']}:{record['local_port']}",
+                "state": record["state"],
+            },
+            "matched_rules": [r["rule_name"] for r in analysis["matched_rules"]],
+            "tags": tags,
+        })
+    
+    if need_heuristics:
+        snapshot.suspicious[high_port_threshold] = suspicious
+    if not need_report:
+        return suspicious, report
     
     # Generate summary
     suspicious_count = sum(len(findings[s]) for s in ["critical", "high", "medium", "low"])
+    normal_count = len(records) - suspicious_count
     
-    return {
+    report = {
         "summary": {
-            "total_connections": len(connections),
+            "total_connections": len(records),
             "suspicious_count": suspicious_count,
+            "normal_count": normal_count,
             "by_severity": {
                 "critical": len(findings["critical"]),
                 "high": len(findings["high"]),
@@ -296,17 +557,35 @@ def analyze_connections() -> dict:
             },
             "detected_tags": list(all_tags),
         },
-        "findings": {
-            "critical": findings["critical"],
-            "high": findings["high"],
-            "medium": findings["medium"],
-            "low": findings["low"],
-        },
+        "findings": findings,
         "rules_loaded": len(config.rules),
     }
+    
+    snapshot.report = (config, report)
+    return suspicious, report
+
+
+# =============================================================================
+# Security Analyst Tools (ntomb-security-analyst)
+# =============================================================================
+
+@mcp.tool()
+@_in_thread
+def analyze_connections() -> dict:
+    """Analyze all current connections against ntomb's detection rules.
+    
+    Applies rules from suspicious_detection.yaml to identify suspicious patterns.
+    Returns a security analysis report with categorized findings.
+    
+    Returns:
+        Analysis report with summary, findings by severity, and recommendations.
+    """
+    _, report = _snapshot_analysis(with_report=True)
+    return {**report, "snapshot_age_ms": _snapshot_age_ms()}
 
 
 @mcp.tool()
+@_in_thread
 def explain_connection(
     pid: Optional[int] = None,
     remote_address: Optional[str] = None,
@@ -325,7 +604,11 @@ def explain_connection(
         Detailed explanation with matched rules, Korean description, and next steps.
     """
     config = get_detection_config()
-    connections = list_connections(pid_filter=pid)
+    if not pid and remote_address and remote_port:
+        # Exact endpoint without a PID: go straight to its records
+        connections = _connection_records().by_remote.get(f"{remote_address}:{remote_port}", [])
+    else:
+        connections = _snapshot_records(pid)
     
     # Find matching connection
     target_conn = None
@@ -369,6 +652,7 @@ def explain_connection(
         "explanations": explanations,
         "investigation_steps_ko": investigation_steps,
         "summary_ko": _generate_summary_ko(target_conn, analysis),
+        "snapshot_age_ms": _snapshot_age_ms(),
     }
 
 
@@ -416,6 +700,7 @@ def get_detection_rules() -> list[dict]:
 
 
 @mcp.tool()
+@_in_thread
 def compare_baseline(
     baseline_pids: Optional[list[int]] = None,
     baseline_remotes: Optional[list[str]] = None
@@ -432,27 +717,17 @@ def compare_baseline(
     Returns:
         Comparison report with new/unexpected connections.
     """
-    connections = list_connections()
+    snapshot = _connection_records()
+    connections = snapshot.records
     
-    current_pids = set(c.get("pid") for c in connections if c.get("pid"))
-    current_remotes = set(
-        f"{c.get('remote_address')}:{c.get('remote_port')}"
-        for c in connections
-        if c.get("remote_address") and c.get("remote_address") != "0.0.0.0"
-    )
+    new_pids = snapshot.pids - frozenset(baseline_pids) if baseline_pids else set()
+    new_remotes = snapshot.remotes - frozenset(baseline_remotes) if baseline_remotes else set()
     
-    baseline_pids_set = set(baseline_pids or [])
-    baseline_remotes_set = set(baseline_remotes or [])
-    
-    new_pids = current_pids - baseline_pids_set if baseline_pids else set()
-    new_remotes = current_remotes - baseline_remotes_set if baseline_remotes else set()
-    
-    # Find connections to new remotes
-    new_connections = []
-    for conn in connections:
-        remote = f"{conn.get('remote_address')}:{conn.get('remote_port')}"
-        if remote in new_remotes or conn.get("pid") in new_pids:
-            new_connections.append(conn)
+    # Find connections of new processes or to new remotes via the indices,
+    # then list each once in scan order (set order would vary between runs)
+    wanted = {id(conn) for pid in new_pids for conn in snapshot.by_pid[pid]}
+    wanted.update(id(conn) for remote in new_remotes for conn in snapshot.by_remote[remote])
+    new_connections = [conn for conn in connections if id(conn) in wanted] if wanted else []
     
     return {
         "summary": {
@@ -464,6 +739,7 @@ def compare_baseline(
         "new_remote_endpoints": list(new_remotes),
         "new_connections": new_connections,
         "recommendation_ko": _generate_baseline_recommendation_ko(new_pids, new_remotes),
+        "snapshot_age_ms": _snapshot_age_ms(),
     }
 
 
@@ -483,7 +759,36 @@ def _generate_baseline_recommendation_ko(new_pids: set, new_remotes: set) -> str
     return "⚠️ " + " ".join(parts)
 
 
+# Extra suggest_investigation step blocks, in output order; "{pid}" is
+# replaced with the process ID
+_TAG_INVESTIGATION_STEP_GROUPS: tuple[tuple[str, ...], ...] = (
+    (
+        "4. 연결 패턴 분석: 주기적인 연결 시도가 있는지 확인",
+        "5. 원격 IP 평판 조회: VirusTotal, AbuseIPDB 등",
+        "6. 바이너리 해시 확인: `sha256sum /proc/{pid}/exe`",
+    ),
+    (
+        "4. 트래픽 모니터링: `nethogs` 또는 `tcpdump`로 데이터 흐름 확인",
+        "5. 최근 접근 파일 확인: `find /proc/{pid}/fd -type l -exec readlink {} \\;`",
+    ),
+    (
+        "4. 소켓 상태 통계: `ss -s`",
+        "5. 애플리케이션 로그 확인",
+        "6. 메모리/FD 사용량 모니터링",
+    ),
+)
+
+# Tag -> index into _TAG_INVESTIGATION_STEP_GROUPS
+_TAG_INVESTIGATION_STEP_GROUP = {
+    "beacon": 0,
+    "c2": 0,
+    "exfiltration": 1,
+    "resource_leak": 2,
+}
+
+
 @mcp.tool()
+@_in_thread
 def suggest_investigation(pid: int) -> dict:
     """Suggest investigation steps for a specific process.
     
@@ -500,14 +805,17 @@ def suggest_investigation(pid: int) -> dict:
     
     # Get process info
     try:
-        proc = psutil.Process(pid)
+        # One as_dict() call reads all fields under a single psutil oneshot
+        info = psutil.Process(pid).as_dict(
+            attrs=['name', 'cmdline', 'username', 'create_time', 'status']
+        )
         process_info = {
             "pid": pid,
-            "name": proc.name(),
-            "cmdline": ' '.join(proc.cmdline())[:200],
-            "username": proc.username(),
-            "create_time": proc.create_time(),
-            "status": proc.status(),
+            "name": info['name'],
+            "cmdline": _join_truncated(info['cmdline'] or (), 200),
+            "username": info['username'],
+            "create_time": info['create_time'],
+            "status": info['status'],
         }
     except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
         return {
@@ -516,22 +824,31 @@ def suggest_investigation(pid: int) -> dict:
         }
     
     # Get connections for this process
-    connections = list_connections(pid_filter=pid)
+    connections = _snapshot_records(pid)
     
     # Analyze each connection
     analyses = []
-    max_severity = "normal"
+    connections_summary = []
+    suspicious_count = 0
+    max_rank = 0
     all_tags = set()
-    severity_order = {"normal": 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
     
-    for conn in connections:
-        analysis = analyze_connection(conn, config)
+    for conn, analysis in zip(connections, analyze_connections_bulk(connections, config)):
         analyses.append(analysis)
+        is_suspicious = analysis.get("is_suspicious", False)
+        connections_summary.append({
+            "remote": f"{conn.get('remote_address')}:{conn.get('remote_port')}",
+            "state": conn.get("state"),
+            "suspicious": is_suspicious,
+        })
         
-        if analysis.get("is_suspicious"):
+        if is_suspicious:
+            suspicious_count += 1
             all_tags.update(analysis.get("tags", []))
-            if severity_order.get(analysis.get("severity", "normal"), 0) > severity_order.get(max_severity, 0):
-                max_severity = analysis.get("severity", "normal")
+            rank = SEVERITY_RANK.get(analysis.get("severity", "normal"), 0)
+            if rank > max_rank:
+                max_rank = rank
+    max_severity = SEVERITY_NAMES[max_rank]
     
     # Generate investigation steps
     investigation_steps = [
@@ -540,43 +857,28 @@ def suggest_investigation(pid: int) -> dict:
         f"3. 네트워크 연결 확인: `ss -tunap | grep {pid}`",
     ]
     
-    if "beacon" in all_tags or "c2" in all_tags:
-        investigation_steps.extend([
-            "4. 연결 패턴 분석: 주기적인 연결 시도가 있는지 확인",
-            "5. 원격 IP 평판 조회: VirusTotal, AbuseIPDB 등",
-            f"6. 바이너리 해시 확인: `sha256sum /proc/{pid}/exe`",
-        ])
-    
-    if "exfiltration" in all_tags:
-        investigation_steps.extend([
-            "4. 트래픽 모니터링: `nethogs` 또는 `tcpdump`로 데이터 흐름 확인",
-            "5. 최근 접근 파일 확인: `find /proc/{pid}/fd -type l -exec readlink {} \\;`",
-        ])
-    
-    if "resource_leak" in all_tags:
-        investigation_steps.extend([
-            "4. 소켓 상태 통계: `ss -s`",
-            "5. 애플리케이션 로그 확인",
-            "6. 메모리/FD 사용량 모니터링",
-        ])
+    # Tag-specific steps, one lookup per tag
+    groups = {
+        _TAG_INVESTIGATION_STEP_GROUP[tag]
+        for tag in all_tags
+        if tag in _TAG_INVESTIGATION_STEP_GROUP
+    }
+    for group in sorted(groups):
+        investigation_steps.extend(
+            step.replace("{pid}", str(pid)) for step in _TAG_INVESTIGATION_STEP_GROUPS[group]
+        )
     
     return {
         "found": True,
         "process": process_info,
         "connection_count": len(connections),
-        "suspicious_count": sum(1 for a in analyses if a.get("is_suspicious")),
+        "suspicious_count": suspicious_count,
         "overall_severity": max_severity,
         "detected_tags": list(all_tags),
-        "connections_summary": [
-            {
-                "remote": f"{c.get('remote_address')}:{c.get('remote_port')}",
-                "state": c.get("state"),
-                "suspicious": analyses[i].get("is_suspicious", False),
-            }
-            for i, c in enumerate(connections)
-        ],
+        "connections_summary": connections_summary,
         "investigation_steps_ko": investigation_steps,
         "summary_ko": _generate_process_summary_ko(process_info, analyses, all_tags),
+        "snapshot_age_ms": _snapshot_age_ms(),
     }
 
 
@@ -598,6 +900,41 @@ def _generate_process_summary_ko(process_info: dict, analyses: list, tags: set)
 # Development Assistant Tools (ntomb-dev-assistant)
 # =============================================================================
 
+# network_map.yaml as (path, mtime_ns, schema, connection state names)
+_network_map_cache: Optional[tuple[Path, int, dict, frozenset]] = None
+
+
+def _load_network_map() -> Optional[tuple[Path, dict, frozenset]]:
+    """Return (path, schema, connection state names) for network_map.yaml.
+    
+    The file is parsed once and reparsed only when its mtime changes. The
+    schema dict is shared across calls, so callers must not modify it.
+    """
+    global _network_map_cache
+    search_paths = [
+        Path(".kiro/specs/network_map.yaml"),
+        Path("../.kiro/specs/network_map.yaml"),
+        Path(__file__).parent.parent / ".kiro/specs/network_map.yaml",
+    ]
+    for path in search_paths:
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            continue
+        
+        cached = _network_map_cache
+        if cached is not None and cached[0] == path and cached[1] == mtime:
+            return cached[0], cached[2], cached[3]
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=YamlLoader)
+        states = frozenset(data.get("connection_states", {}).keys())
+        _network_map_cache = (path, mtime, data, states)
+        return path, data, states
+    
+    return None
+
+
 @mcp.tool()
 def get_network_map_schema() -> dict:
     """Get the network_map.yaml schema for ntomb development.
@@ -609,28 +946,14 @@ def get_network_map_schema() -> dict:
     Returns:
         Schema definition with node_types, edge_types, connection_states, and layout rules.
     """
-    import yaml
-    
-    yaml_path = None
-    search_paths = [
-        Path(".kiro/specs/network_map.yaml"),
-        Path("../.kiro/specs/network_map.yaml"),
-        Path(__file__).parent.parent / ".kiro/specs/network_map.yaml",
-    ]
-    
-    for path in search_paths:
-        if path.exists():
-            yaml_path = path
-            break
-    
-    if yaml_path is None or not yaml_path.exists():
+    network_map = _load_network_map()
+    if network_map is None:
         return {
             "found": False,
             "message": "network_map.yaml을 찾을 수 없습니다.",
         }
     
-    with open(yaml_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+    data = network_map[1]
     
     # Generate Rust struct suggestions
     rust_structs = _generate_rust_structs_from_schema(data)
@@ -657,34 +980,36 @@ def _generate_rust_structs_from_schema(schema: dict) -> list[str]:
         fields = node_def.get("fields", [])
         struct_name = "".join(word.capitalize() for word in node_name.split("_"))
         
-        rust_fields = []
-        for field in fields:
-            field_name = field.get("name", "unknown")
-            field_type = _yaml_type_to_rust(field.get("type", "string"), field.get("required", True))
-            rust_fields.append(f"    pub {field_name}: {field_type},")
-        
-        struct_code = f"""#[derive(Debug, Clone, Serialize, Deserialize)]
-pub struct {struct_name} {{
-{chr(10).join(rust_fields)}
-}}"""
-        structs.append(struct_code)
+        lines = [
+            "#[derive(Debug, Clone, Serialize, Deserialize)]",
+            f"pub struct {struct_name} {{",
+        ]
+        for field_def in fields:
+            field_name = field_def.get("name", "unknown")
+            field_type = _yaml_type_to_rust(field_def.get("type", "string"), field_def.get("required", True))
+            lines.append(f"    pub {field_name}: {field_type},")
+        lines.append("}")
+        structs.append("\n".join(lines))
     
     return structs
 
 
+# network_map.yaml field type -> Rust type (anything else becomes String)
+_YAML_TO_RUST = {
+    "u32": "u32",
+    "u16": "u16",
+    "u64": "u64",
+    "usize": "usize",
+    "string": "String",
+    "bool": "bool",
+    "list<string>": "Vec<String>",
+}
+
+
+@lru_cache(maxsize=64)
 def _yaml_type_to_rust(yaml_type: str, required: bool) -> str:
     """Convert YAML type to Rust type."""
-    type_map = {
-        "u32": "u32",
-        "u16": "u16",
-        "u64": "u64",
-        "usize": "usize",
-        "string": "String",
-        "bool": "bool",
-        "list<string>": "Vec<String>",
-    }
-    
-    rust_type = type_map.get(yaml_type, "String")
+    rust_type = _YAML_TO_RUST.get(yaml_type, "String")
     
     if not required:
         return f"Option<{rust_type}>"
@@ -704,10 +1029,8 @@ def validate_rule_coverage() -> dict:
     config = get_detection_config()
     
     # Rules that have Korean explanations (considered "documented")
-    from .detection_rules import RULE_EXPLANATIONS_KO
-    
     documented_rules = set(RULE_EXPLANATIONS_KO.keys())
-    all_rules = {rule.id for rule in config.rules}
+    all_rules = config.rule_ids
     
     # Check coverage
     covered = all_rules & documented_rules
@@ -737,7 +1060,7 @@ def validate_rule_coverage() -> dict:
     # Generate suggestions for undocumented rules
     suggestions = []
     for rule_id in undocumented:
-        rule = next((r for r in config.rules if r.id == rule_id), None)
+        rule = config.rules_by_id.get(rule_id)
         if rule:
             suggestions.append({
                 "rule_id": rule_id,
@@ -770,6 +1093,31 @@ def _generate_coverage_recommendation_ko(covered: set, undocumented: set) -> str
            (f" 외 {len(undocumented) - 5}개" if len(undocumented) > 5 else "")
 
 
+# Pattern description keywords for suggest_new_rule, by tag (in output order)
+_PATTERN_KEYWORDS = {
+    "beacon": ["beacon", "비콘", "주기적", "periodic", "interval"],
+    "exfiltration": ["exfil", "유출", "대용량", "large", "transfer"],
+    "backdoor": ["backdoor", "백도어", "listener", "리스너", "bind"],
+    "scanning": ["scan", "스캔", "probe", "탐색"],
+    "c2": ["c2", "command", "control", "명령"],
+    "anomaly": ["unusual", "이상", "unexpected", "비정상"],
+}
+_PATTERN_KEYWORD_TAGS = {
+    word: tag for tag, words in _PATTERN_KEYWORDS.items() for word in words
+}
+# Tags that make a suggested rule high severity; everything else is medium
+_HIGH_SEVERITY_PATTERN_TAGS = frozenset({"c2", "exfiltration", "backdoor"})
+# Zero-width lookahead so overlapping keywords are all reported in one scan
+_PATTERN_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(
+        re.escape(word) for word in sorted(_PATTERN_KEYWORD_TAGS, key=len, reverse=True)
+    ) + "))"
+)
+
+# Runs of characters not allowed in a generated rule id
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+
 @mcp.tool()
 def suggest_new_rule(
     pattern_description: str,
@@ -788,36 +1136,18 @@ def suggest_new_rule(
         Suggested rule definition with YAML format and implementation hints.
     """
     # Analyze pattern description for keywords
-    keywords = {
-        "beacon": ["beacon", "비콘", "주기적", "periodic", "interval"],
-        "exfiltration": ["exfil", "유출", "대용량", "large", "transfer"],
-        "backdoor": ["backdoor", "백도어", "listener", "리스너", "bind"],
-        "scanning": ["scan", "스캔", "probe", "탐색"],
-        "c2": ["c2", "command", "control", "명령"],
-        "anomaly": ["unusual", "이상", "unexpected", "비정상"],
-    }
-    
-    detected_tags = []
     pattern_lower = pattern_description.lower()
-    for tag, words in keywords.items():
-        if any(word in pattern_lower for word in words):
-            detected_tags.append(tag)
+    found = {_PATTERN_KEYWORD_TAGS[word] for word in _PATTERN_KEYWORD_RE.findall(pattern_lower)}
+    detected_tags = [tag for tag in _PATTERN_KEYWORDS if tag in found]
     
     if not detected_tags:
         detected_tags = ["anomaly"]
     
     # Determine severity based on tags
-    severity = "medium"
-    if "c2" in detected_tags or "exfiltration" in detected_tags:
-        severity = "high"
-    elif "backdoor" in detected_tags:
-        severity = "high"
-    elif "scanning" in detected_tags:
-        severity = "medium"
+    severity = "high" if found & _HIGH_SEVERITY_PATTERN_TAGS else "medium"
     
     # Generate rule ID
-    import re
-    rule_id = re.sub(r'[^a-z0-9]+', '_', pattern_description.lower()[:30]).strip('_')
+    rule_id = _SLUG_RE.sub('_', pattern_description.lower()[:30]).strip('_')
     
     # Analyze observed connections if provided
     match_criteria = {}
@@ -888,29 +1218,16 @@ def analyze_spec_consistency() -> dict:
     Returns:
         Consistency report with findings and recommendations.
     """
-    import yaml
-    
     findings = []
     
     # Load detection rules
     config = get_detection_config()
-    detection_rule_ids = {rule.id for rule in config.rules}
-    detection_tags = set()
-    for rule in config.rules:
-        detection_tags.update(rule.tags)
+    detection_rule_ids = config.rule_ids
+    detection_tags = config.all_tags
     
     # Load network_map.yaml
-    network_map_path = None
-    for path in [Path(".kiro/specs/network_map.yaml"), Path("../.kiro/specs/network_map.yaml")]:
-        if path.exists():
-            network_map_path = path
-            break
-    
-    network_map_states = set()
-    if network_map_path:
-        with open(network_map_path, 'r', encoding='utf-8') as f:
-            network_map = yaml.safe_load(f)
-            network_map_states = set(network_map.get("connection_states", {}).keys())
+    network_map = _load_network_map()
+    network_map_states = network_map[2] if network_map else frozenset()
     
     # Check: Detection rules reference valid connection states
     for rule in config.rules:
@@ -962,7 +1279,7 @@ def analyze_spec_consistency() -> dict:
         "findings": findings,
         "specs_analyzed": [
             "suspicious_detection.yaml",
-            "network_map.yaml" if network_map_path else "(not found)",
+            "network_map.yaml" if network_map else "(not found)",
         ],
         "recommendation_ko": _generate_consistency_recommendation_ko(findings),
     }